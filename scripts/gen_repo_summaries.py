@@ -1,58 +1,287 @@
 #!/usr/bin/env python3
 import argparse
+import asyncio
+import hashlib
 import os
+import re
 import sys
+import tempfile
+import textwrap
+import aiohttp
+import diskcache
+import numpy as np
 import requests
-import pandas as pd
 import openai
+import tiktoken
 import json
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is used instead
+    orjson = None
+
+try:
+    import re2 as re_engine  # optional; linear-time matching on adversarial READMEs
+except ImportError:
+    re_engine = re
+
+# Cap on in-flight GitHub requests, to stay clear of secondary rate limits
+GITHUB_CONCURRENCY = 10
+# Cap on in-flight OpenAI requests; 429s beyond this are retried with backoff
+OPENAI_CONCURRENCY = 10
+# Fetched READMEs waiting for a summary worker
+README_QUEUE_SIZE = 32
+
+# READMEs are cleaned of inline blobs and cut to this many tokens before
+# being sent
+README_TOKEN_BUDGET = 2000
+# ...or to this many characters when the tokenizer is unavailable
+README_CHAR_BUDGET = 3000
+# READMEs shorter than this carry too little to be worth an OpenAI call
+MIN_README_CHARS = 200
+_RE_DATA_IMAGE = re_engine.compile(r'!\[.*?\]\(data:[^)]+\)')
+_RE_HTML_COMMENT = re_engine.compile(r'(?s)<!--.*?-->')
+# Lines holding a long whitespace-free run (minified code, inline blobs) or
+# consisting solely of base64; ordinary prose paragraphs never match
+_RE_BLOB_LINE = re_engine.compile(r'\S{200,}|^\s*[A-Za-z0-9+/]{60,}={0,2}\s*$')
+
+# max_tokens=200 already caps a completion at roughly 800 characters; this is
+# only a guard that stops a stream running past anything that cap allows
+SUMMARY_MAX_CHARS = 1000
+# End of a sentence followed by the start of another, e.g. not the dot in
+# "Node.js" (stdlib re: re2 has no lookahead)
+_RE_SENTENCE_END = re.compile(r'[.!?]["\')\]]?(?=\s+["\'(\[]?[A-Z0-9])')
+
+# Seconds between status checks while an OpenAI batch is running
+BATCH_POLL_INTERVAL = 30
+
+SYSTEM_PROMPT = "You are a technical writer specializing in creating compelling project descriptions for developer portfolios."
+
+# Fixed instructions around the per-repository details, built once at import
+# time; only the repository context and README are formatted per call
+PROMPT_PREFIX = """Create an engaging portfolio summary for this software project. Focus on:
+- What the project does and its main purpose
+- Key features and capabilities
+- Technical implementation highlights
+- Why it's impressive or noteworthy
+
+"""
+PROMPT_SUFFIX = """
+
+Write a compelling 3-4 sentence summary that would showcase this project well in a developer portfolio. Make it sound professional but engaging, highlighting the technical skills and problem-solving involved."""
+
+# Summary cache: entries expire after CACHE_TTL, and the optional semantic
+# tier reuses a summary whose prompt embedding is at least this similar
+CACHE_TTL = 30 * 24 * 3600
+EMBEDDING_MODEL = "text-embedding-3-small"
+SEMANTIC_THRESHOLD = 0.95
+
+GITHUB_HEADERS = {
+    "User-Agent": "GitHubRepoSummarizer/1.0",
+    "Accept": "application/vnd.github.mercy-preview+json"  # For topics
+}
 
 # -------------------------------------
-# Helpers to fetch GitHub data
+# Shared clients
 # -------------------------------------
 
-def fetch_repositories(org, token):
-    """Fetch all repositories for a given GitHub organization."""
-    url = f"https://api.github.com/orgs/{org}/repos"
-    
-    # Headers to include topics in response
-    headers = {
-        "User-Agent": "GitHubRepoSummarizer/1.0",
-        "Accept": "application/vnd.github.mercy-preview+json"  # For topics
-    }
-    
-    print(f"Attempting to fetch public repos without authentication")
+# Built on first use and then reused for the life of the process, so callers
+# importing this module pay connection and encoder setup only once.
+
+@lru_cache(maxsize=1)
+def _http_session():
+    """The keep-alive session used for every synchronous GitHub call.
+
+    Transient 5xx and rate-limit responses are retried with backoff; once
+    retries run out the last response is returned so callers can inspect
+    the status as before. POST is retried too: the only POST is the
+    read-only GraphQL listing query, which is safe to repeat.
+    """
+    session = requests.Session()
+    session.headers.update(GITHUB_HEADERS)
+    session.mount("https://", HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"},
+            raise_on_status=False,
+        ),
+    ))
+    return session
+
+
+@lru_cache(maxsize=1)
+def _tiktoken_encoder():
+    """The cl100k_base encoder, or None if it cannot be loaded.
+
+    tiktoken downloads the encoding on first use, so being offline or
+    rate-limited must not abort the run; READMEs are then cut by characters.
+    """
     try:
-        resp = requests.get(url, headers=headers)
-        print(f"Public access status: {resp.status_code}")
-        if resp.status_code == 200:
-            return resp.json()
+        return tiktoken.get_encoding("cl100k_base")
     except Exception as e:
-        print(f"Public access attempt failed: {e}")
-    
-    # If that fails, try with token auth
-    print(f"Attempting with token authentication")
-    auth_headers = {
-        "Authorization": f"token {token}",
-        "User-Agent": "GitHubRepoSummarizer/1.0",
-        "Accept": "application/vnd.github.mercy-preview+json"  # For topics
+        print(f"⚠️  Could not load tiktoken encoding, truncating READMEs by characters: {e}", file=sys.stderr)
+        return None
+
+
+def _openai_client():
+    """The AsyncOpenAI client for the running event loop.
+
+    Its connection pool is bound to the loop it was first used on, so a new
+    client is made for each ``asyncio.run`` rather than one per process.
+    """
+    return _openai_client_for(asyncio.get_running_loop())
+
+
+@lru_cache(maxsize=1)
+def _openai_client_for(loop):
+    return openai.AsyncOpenAI()
+
+# -------------------------------------
+# Helpers to fetch GitHub data
+# -------------------------------------
+
+# GitHub answers a matching If-None-Match with an empty 304, which does not
+# count against the rate limit. The HTTP cache maps request -> (etag, body, Link).
+
+def get_cached(url, http_cache=None, headers=None, params=None):
+    """GET ``url`` through the shared session, revalidating any stored copy by ETag.
+
+    A 304 is turned back into a 200 carrying the stored body and Link header,
+    so callers can treat the response like a fresh one.
+    """
+    if http_cache is None:
+        return _http_session().get(url, headers=headers, params=params)
+
+    key = requests.Request('GET', url, params=params).prepare().url
+    cached = http_cache.get(key)
+    headers = dict(headers or {})
+    if cached:
+        headers['If-None-Match'] = cached[0]
+
+    resp = _http_session().get(url, headers=headers, params=params)
+    if resp.status_code == 304 and cached:
+        resp.status_code = 200
+        resp._content = cached[1]
+        if cached[2]:
+            resp.headers['Link'] = cached[2]
+    elif resp.status_code == 200 and resp.headers.get('ETag'):
+        http_cache.set(key, (resp.headers['ETag'], resp.content, resp.headers.get('Link')),
+                       expire=CACHE_TTL)
+    return resp
+
+
+async def aget_cached(session, url, http_cache=None, headers=None):
+    """Return the body of ``url`` fetched on ``session``, revalidating by ETag.
+
+    Stored copies are keyed by URL and Accept header, since GitHub serves
+    different representations of the same URL. Raises
+    ``aiohttp.ClientResponseError`` on an error status.
+    """
+    headers = dict(headers or {})
+    key = (url, headers.get('Accept'))
+    cached = http_cache.get(key) if http_cache is not None else None
+    if cached:
+        headers['If-None-Match'] = cached[0]
+
+    async with session.get(url, headers=headers) as resp:
+        if resp.status == 304 and cached:
+            return cached[1]
+        resp.raise_for_status()
+        body = await resp.read()
+        if http_cache is not None and resp.headers.get('ETag'):
+            http_cache.set(key, (resp.headers['ETag'], body, resp.headers.get('Link')),
+                           expire=CACHE_TTL)
+        return body
+
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+# Repositories per GraphQL page. Each node carries a full README, so pages are
+# kept well below the API maximum to avoid slow responses and 502 timeouts.
+GRAPHQL_PAGE_SIZE = 25
+
+# One page of an organization's public repositories, README.md included, so
+# the listing and README downloads collapse into a single round trip per page
+ORG_REPOS_QUERY = """
+query($org: String!, $first: Int!, $cursor: String) {
+  organization(login: $org) {
+    repositories(first: $first, after: $cursor, privacy: PUBLIC) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        nameWithOwner
+        url
+        description
+        primaryLanguage { name }
+        stargazerCount
+        forkCount
+        issues(states: OPEN) { totalCount }
+        pullRequests(states: OPEN) { totalCount }
+        repositoryTopics(first: 20) { nodes { topic { name } } }
+        isFork
+        isArchived
+        isDisabled
+        readme: object(expression: "HEAD:README.md") { ... on Blob { text } }
+      }
     }
-    
-    resp = requests.get(url, headers=auth_headers)
-    print(f"Authenticated access status: {resp.status_code}")
-    if resp.status_code != 200:
-        print(f"Response content: {resp.text[:500]}")
-    
-    resp.raise_for_status()
-    return resp.json()
+  }
+}
+"""
+
 
+def fetch_all_graphql(org, token):
+    """Fetch every public repository of an organization, READMEs included.
+
+    Nodes are converted to the REST field names the rest of the script uses,
+    plus a ``readme`` key holding the README.md text, or None when the
+    repository has no README.md blob (other README names are fetched later).
+    """
+    headers = {"Authorization": f"bearer {token}"}
+    repos, cursor = [], None
+    while True:
+        resp = _http_session().post(GRAPHQL_URL, headers=headers, json={
+            "query": ORG_REPOS_QUERY,
+            "variables": {"org": org, "first": GRAPHQL_PAGE_SIZE, "cursor": cursor},
+        })
+        if resp.status_code != 200:
+            print(f"Response content: {resp.text[:500]}")
+        resp.raise_for_status()
+        payload = resp.json()
+        if payload.get('errors'):
+            raise RuntimeError(f"GitHub GraphQL query failed: {payload['errors']}")
 
-def fetch_specific_repos(repo_list, token):
+        page = payload['data']['organization']['repositories']
+        for node in page['nodes']:
+            repos.append({
+                'full_name': node['nameWithOwner'],
+                'html_url': node['url'],
+                'description': node['description'],
+                'language': (node['primaryLanguage'] or {}).get('name'),
+                'stargazers_count': node['stargazerCount'],
+                'forks_count': node['forkCount'],
+                # REST's open_issues_count includes open pull requests
+                'open_issues_count': node['issues']['totalCount'] + node['pullRequests']['totalCount'],
+                'topics': [t['topic']['name'] for t in node['repositoryTopics']['nodes']],
+                'fork': node['isFork'],
+                'archived': node['isArchived'],
+                'disabled': node['isDisabled'],
+                'readme': (node['readme'] or {}).get('text'),
+            })
+        if not page['pageInfo']['hasNextPage']:
+            return repos
+        cursor = page['pageInfo']['endCursor']
+
+
+def fetch_specific_repos(repo_list, token, http_cache=None):
     """Fetch individual repositories by full name (org/repo)."""
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github.mercy-preview+json"  # For topics
-    }
+    headers = {"Authorization": f"token {token}"}
     results = []
     for full in repo_list:
         try:
@@ -61,7 +290,7 @@ def fetch_specific_repos(repo_list, token):
             print(f"⚠️  Invalid repository format: '{full}', skipping.", file=sys.stderr)
             continue
         url = f"https://api.github.com/repos/{org}/{repo}"
-        resp = requests.get(url, headers=headers)
+        resp = get_cached(url, http_cache, headers=headers)
         if resp.status_code == 200:
             results.append(resp.json())
         else:
@@ -69,54 +298,139 @@ def fetch_specific_repos(repo_list, token):
     return results
 
 
-def fetch_readme(org, repo, token):
+async def afetch_readme(session, org, repo, http_cache=None):
     """Fetch the README text for a given repository."""
     url = f"https://api.github.com/repos/{org}/{repo}/readme"
-    headers = {"Authorization": f"token {token}"}
-    resp = requests.get(url, headers=headers)
-    resp.raise_for_status()
-    data = resp.json()
-    download_url = data.get('download_url')
-    if not download_url:
-        return ""
-    readme_resp = requests.get(download_url)
-    return readme_resp.text
+    # The raw media type returns the file itself, saving the download_url hop
+    try:
+        body = await aget_cached(session, url, http_cache,
+                                 headers={"Accept": "application/vnd.github.raw"})
+    except aiohttp.ClientResponseError as e:
+        if e.status == 404:  # repository has no README
+            return ""
+        raise
+    return body.decode('utf-8', errors='replace')
 
 # -------------------------------------
-# Build DataFrame and summarize
+# Summary cache
 # -------------------------------------
 
-def create_repo_dataframe(repos, token):
-    """Convert repository metadata into a DataFrame, including README."""
-    rows = []
-    for r in repos:
-        full = r.get('full_name', '')
-        if '/' not in full:
-            continue
-        org, name = full.split('/', 1)
-        try:
-            readme = fetch_readme(org, name, token)
-        except Exception:
-            readme = ""
-        rows.append({
-            'Name': name,
-            'FullName': full,
-            'URL': r.get('html_url', ''),
-            'Description': r.get('description') or '',
-            'Language': r.get('language') or '',
-            'Stars': r.get('stargazers_count', 0),
-            'Forks': r.get('forks_count', 0),
-            'OpenIssues': r.get('open_issues_count', 0),
-            'Topics': r.get('topics', []),  # GitHub topics/tags
-            'README': readme,
-        })
-    return pd.DataFrame(rows)
+class SummaryCache:
+    """On-disk cache of generated summaries.
+
+    Exact hits are keyed by the SHA-256 of (model, system prompt, prompt).
+    With ``semantic=True`` a miss falls back to comparing the embedding of
+    the prompt's repository content against earlier summaries of the same
+    repository, so minor README edits reuse its summary. Summaries of other
+    repositories are never considered, since a README names its project.
+    """
+
+    def __init__(self, directory, semantic=False, ttl=CACHE_TTL, threshold=SEMANTIC_THRESHOLD):
+        self.store = diskcache.Cache(directory)
+        self.semantic = semantic
+        self.ttl = ttl
+        self.threshold = threshold
+        self._matrices = {}  # (model, dim) -> (embedding matrix, summaries, full names)
+
+    @staticmethod
+    def key(model, prompt):
+        return hashlib.sha256(f"{model}|{SYSTEM_PROMPT}|{prompt}".encode()).hexdigest()
+
+    def get(self, key):
+        return self.store.get(('summary', key))
+
+    def set(self, key, summary, model, embedding=None, full_name=None):
+        self.store.set(('summary', key), summary, expire=self.ttl)
+        if embedding is None:
+            return
+        self.store.set(('repo-embedding', model, len(embedding), key),
+                       (embedding, summary, full_name), expire=self.ttl)
+        matrix, summaries, names = self._partition(model, len(embedding))
+        self._matrices[(model, len(embedding))] = (
+            np.vstack([matrix, embedding[None, :]]), summaries + [summary], names + [full_name])
+
+    def nearest(self, model, embedding, full_name):
+        """Return the cached summary of ``full_name`` most similar to ``embedding``, if close enough."""
+        matrix, summaries, names = self._partition(model, len(embedding))
+        rows = [i for i, name in enumerate(names) if name == full_name]
+        if not rows:
+            return None
+        scores = matrix[rows] @ embedding
+        best = int(np.argmax(scores))
+        return summaries[rows[best]] if scores[best] >= self.threshold else None
+
+    def _partition(self, model, dim):
+        """Load (once per process) the embedding matrix for one model and dimension."""
+        part = (model, dim)
+        if part not in self._matrices:
+            vectors, summaries, names = [], [], []
+            for k in self.store.iterkeys():
+                if k[0] != 'repo-embedding' or k[1:3] != part:
+                    continue
+                entry = self.store.get(k)  # None once expired
+                if entry is not None:
+                    vectors.append(entry[0])
+                    summaries.append(entry[1])
+                    names.append(entry[2])
+            matrix = np.vstack(vectors) if vectors else np.empty((0, dim), dtype=np.float32)
+            self._matrices[part] = (matrix, summaries, names)
+        return self._matrices[part]
+
+
+async def embed_text(client, text):
+    """Return the unit-normalized embedding of ``text``."""
+    resp = await client.embeddings.create(model=EMBEDDING_MODEL, input=text)
+    vec = np.asarray(resp.data[0].embedding, dtype=np.float32)
+    return vec / np.linalg.norm(vec)
+
+# -------------------------------------
+# Summarize and write records
+# -------------------------------------
 
+def truncate_readme(content):
+    """Strip binary-looking noise from a README and cut it to README_TOKEN_BUDGET tokens."""
+    content = _RE_DATA_IMAGE.sub('', content)
+    content = _RE_HTML_COMMENT.sub('', content)
+    content = "\n".join(line for line in content.splitlines() if not _RE_BLOB_LINE.search(line))
+    encoder = _tiktoken_encoder()
+    if encoder is None:
+        return content[:README_CHAR_BUDGET]
+    tokens = encoder.encode(content, disallowed_special=())
+    if len(tokens) <= README_TOKEN_BUDGET:
+        return content
+    return encoder.decode(tokens[:README_TOKEN_BUDGET])
 
-def summarize_readme(content, repo_name, language, description, topics):
-    """Generate a compelling portfolio summary of the README via OpenAI."""
+
+def local_summary(r, content):
+    """Describe a low-value repository from its metadata, skipping OpenAI.
+
+    Archived or disabled repositories, unstarred forks and near-empty READMEs
+    get a one-line summary built from the GitHub description. Returns None
+    when the repository should be summarized by the model (or has no
+    description to fall back on).
+    """
+    description = r.get('description') or ''
+    if not description:
+        return None
+    low_value = (
+        r.get('archived')
+        or r.get('disabled')
+        or (r.get('fork') and not r.get('stargazers_count'))
+        or len(content.strip()) < MIN_README_CHARS
+    )
+    if not low_value:
+        return None
+    return f"{description} ({r.get('language') or 'software'} project)"
+
+
+def build_prompt(r, content):
+    """Build the summary prompt for one repository, or None if there is nothing to summarize."""
+    repo_name = r['full_name'].split('/', 1)[1]
+    language = r.get('language') or ''
+    description = r.get('description') or ''
+    topics = r.get('topics', [])
     if not content and not description:
-        return ""
+        return None
     
     # Create a more comprehensive prompt for better summaries
     context_info = f"Repository: {repo_name}"
@@ -127,55 +441,348 @@ def summarize_readme(content, repo_name, language, description, topics):
     if topics:
         context_info += f"\nTopics/Tags: {', '.join(topics)}"
     
-    prompt = f"""Create an engaging portfolio summary for this software project. Focus on:
-- What the project does and its main purpose
-- Key features and capabilities
-- Technical implementation highlights
-- Why it's impressive or noteworthy
+    readme = truncate_readme(content).strip() if content else ''
+    readme = readme or 'No README available'
+    return PROMPT_PREFIX + context_info + "\n\nREADME Content:\n" + readme + PROMPT_SUFFIX
+
 
-{context_info}
+def chat_request(model, prompt):
+    """Chat completion parameters for a summary prompt."""
+    return {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        "max_tokens": 200,
+        "temperature": 0.7,
+    }
 
-README Content:
-{content[:3000] if content else 'No README available'}
 
-Write a compelling 3-4 sentence summary that would showcase this project well in a developer portfolio. Make it sound professional but engaging, highlighting the technical skills and problem-solving involved."""
+def fallback_summary(description, language, error):
+    """Summary to use when OpenAI could not produce one."""
+    if description:
+        return f"{description} This {language or 'software'} project demonstrates practical development skills and problem-solving capabilities."
+    return f"[Error generating summary: {error}]"
+
+
+async def summarize_readme(client, model, r, content, cache=None, inflight=None):
+    """Generate a compelling portfolio summary of the README via OpenAI.
+
+    ``inflight`` maps prompt keys to running summary tasks; repositories whose
+    prompt is identical to one already being summarized await that task
+    instead of sending a duplicate request.
+    """
+    summary = local_summary(r, content)
+    if summary is not None:
+        return summary
+    prompt = build_prompt(r, content)
+    if prompt is None:
+        return ""
+
+    key = SummaryCache.key(model, prompt)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    if inflight is None:
+        return await generate_summary(client, model, r, prompt, key, cache)
+    if key not in inflight:
+        inflight[key] = asyncio.ensure_future(generate_summary(client, model, r, prompt, key, cache))
+    return await asyncio.shield(inflight[key])
+
+
+async def generate_summary(client, model, r, prompt, key, cache=None):
+    """Ask the model for a summary of ``prompt``, storing it in ``cache`` under ``key``."""
+    embedding = None
+    if cache is not None and cache.semantic:
+        # The fixed instructions would only inflate similarity between
+        # README versions, so embed the repository content alone
+        try:
+            embedding = await embed_text(client, prompt[len(PROMPT_PREFIX):-len(PROMPT_SUFFIX)])
+        except Exception as e:
+            # Only the semantic lookup is lost; still ask for a real summary
+            print(f"⚠️  Embedding failed, skipping semantic cache lookup: {e}", file=sys.stderr)
+        if embedding is not None:
+            similar = cache.nearest(model, embedding, r['full_name'])
+            if similar is not None:
+                cache.set(key, similar, model)
+                return similar
 
     try:
-        # Use the newer OpenAI client syntax
-        client = openai.OpenAI()
-        resp = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a technical writer specializing in creating compelling project descriptions for developer portfolios."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=200,
-            temperature=0.7
-        )
-        return resp.choices[0].message.content.strip()
+        async for attempt in AsyncRetrying(
+            retry=retry_if_exception_type(openai.RateLimitError),
+            wait=wait_random_exponential(min=1, max=60),
+            stop=stop_after_attempt(6),
+            reraise=True,
+        ):
+            with attempt:
+                parts, length, finish_reason = [], 0, None
+                stream = await client.chat.completions.create(**chat_request(model, prompt), stream=True)
+                async with stream:
+                    async for chunk in stream:
+                        if not chunk.choices:
+                            continue
+                        delta = chunk.choices[0].delta.content or ''
+                        finish_reason = chunk.choices[0].finish_reason or finish_reason
+                        parts.append(delta)
+                        length += len(delta)
+                        if length > SUMMARY_MAX_CHARS:
+                            break
+        summary = ''.join(parts).strip()
+        if length > SUMMARY_MAX_CHARS or finish_reason == 'length':
+            # Cut the truncated completion back to its last full sentence
+            ends = [m.end() for m in _RE_SENTENCE_END.finditer(summary)]
+            if ends:
+                summary = summary[:ends[-1]]
+        if cache is not None:
+            cache.set(key, summary, model, embedding, r['full_name'])
+        return summary
     except Exception as e:
         # Fallback to use the basic description if OpenAI fails
-        if description:
-            return f"{description} This {language or 'software'} project demonstrates practical development skills and problem-solving capabilities."
-        return f"[Error generating summary: {e}]"
-
-
-def add_summaries(df):
-    """Add portfolio-style summaries to the dataframe."""
-    summaries = []
-    for _, row in df.iterrows():
-        summary = summarize_readme(
-            row['README'], 
-            row['Name'], 
-            row['Language'], 
-            row['Description'],
-            row['Topics']
-        )
-        summaries.append(summary)
-        print(f"✓ Generated summary for {row['Name']}")
-    
-    df['Summary'] = summaries
-    return df
+        return fallback_summary(r.get('description') or '', r.get('language') or '', e)
+
+
+async def summarize_batch(client, model, prompts):
+    """Summarize ``{custom_id: prompt}`` through the OpenAI Batch API.
+
+    Waits for the batch to finish (up to its 24h completion window) and
+    returns ``{custom_id: summary}`` for every request that succeeded.
+    """
+    lines = [
+        json.dumps({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": chat_request(model, prompt),
+        })
+        for custom_id, prompt in prompts.items()
+    ]
+    batch_file = await client.files.create(
+        file=("summaries.jsonl", "\n".join(lines).encode()),
+        purpose="batch",
+    )
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    print(f"⏳ Submitted batch {batch.id} with {len(prompts)} requests")
+
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        await asyncio.sleep(BATCH_POLL_INTERVAL)
+        batch = await client.batches.retrieve(batch.id)
+    print(f"Batch {batch.id} finished with status {batch.status}")
+
+    # Expired or cancelled batches still report whatever did complete
+    if not batch.output_file_id:
+        return {}
+    output = await client.files.content(batch.output_file_id)
+    summaries = {}
+    for line in output.text.splitlines():
+        result = json.loads(line)
+        response = result.get("response") or {}
+        if response.get("status_code") == 200:
+            summaries[result["custom_id"]] = response["body"]["choices"][0]["message"]["content"].strip()
+    return summaries
+
+
+def repo_record(r, summary):
+    """Build the portfolio JSON record for one repository."""
+    stars = r.get('stargazers_count', 0)
+    forks = r.get('forks_count', 0)
+    return {
+        'name': r['full_name'].split('/', 1)[1],
+        'fullName': r['full_name'],
+        'url': r.get('html_url', ''),
+        'description': r.get('description') or '',
+        'language': r.get('language') or '',
+        'stars': stars,
+        'forks': forks,
+        'openIssues': r.get('open_issues_count', 0),
+        'topics': r.get('topics', []),  # GitHub topics/tags
+        'summary': summary,
+        'featured': stars > 5 or forks > 2,  # Auto-mark popular repos as featured
+    }
+
+
+async def fetch_repo_readme(session, r, http_cache=None):
+    """Fetch the README for a repository, or "" if it has none or the fetch fails.
+
+    A README already fetched with the repository (GraphQL listings) is popped
+    from ``r`` and returned without a request.
+    """
+    readme = r.pop('readme', None)
+    if readme is not None:
+        return readme
+    org, name = r['full_name'].split('/', 1)
+    try:
+        return await afetch_readme(session, org, name, http_cache)
+    except Exception:
+        return ""
+
+
+async def process_repos(repos, token, model='gpt-3.5-turbo', cache=None, http_cache=None):
+    """Fetch, summarize and yield one record per repository, in input order.
+
+    GITHUB_CONCURRENCY fetch workers feed READMEs through a bounded queue to
+    OPENAI_CONCURRENCY summary workers, so summarizing starts as soon as the
+    first README arrives. At most README_QUEUE_SIZE fetched READMEs wait in
+    memory, and no README reaches the output.
+    """
+    repos = [r for r in repos if '/' in r.get('full_name', '')]
+    headers = {"Authorization": f"token {token}"}
+    client = _openai_client()
+
+    todo = asyncio.Queue()
+    for i, r in enumerate(repos):
+        todo.put_nowait((i, r))
+    fetched = asyncio.Queue(maxsize=README_QUEUE_SIZE)
+    loop = asyncio.get_running_loop()
+    results = [loop.create_future() for _ in repos]
+    inflight = {}
+
+    async with aiohttp.ClientSession(headers=headers) as session:
+        async def fetch_worker():
+            while not todo.empty():
+                i, r = todo.get_nowait()
+                readme = await fetch_repo_readme(session, r, http_cache)
+                await fetched.put((i, r, readme))
+
+        async def fetch_all():
+            await asyncio.gather(*[fetch_worker() for _ in range(GITHUB_CONCURRENCY)])
+            for _ in range(OPENAI_CONCURRENCY):
+                await fetched.put(None)  # one stop signal per summary worker
+
+        async def summary_worker():
+            while True:
+                item = await fetched.get()
+                if item is None:
+                    return
+                i, r, readme = item
+                try:
+                    summary = await summarize_readme(client, model, r, readme, cache, inflight)
+                except Exception as e:
+                    # One repository's failure must not abort the whole output
+                    print(f"Summary failed for {r['full_name']}: {e}", file=sys.stderr)
+                    summary = fallback_summary(r.get('description') or '', r.get('language') or '', e)
+                    results[i].set_result(repo_record(r, summary))
+                    continue
+                print(f"✓ Generated summary for {r['full_name'].split('/', 1)[1]}")
+                results[i].set_result(repo_record(r, summary))
+
+        workers = [asyncio.ensure_future(fetch_all())]
+        workers += [asyncio.ensure_future(summary_worker()) for _ in range(OPENAI_CONCURRENCY)]
+        try:
+            for result in results:
+                yield await result
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+
+async def process_repos_batch(repos, token, model='gpt-3.5-turbo', cache=None, http_cache=None):
+    """Like process_repos, but send every uncached summary in one OpenAI batch.
+
+    Batches cost about half as much and are not subject to per-minute rate
+    limits, but may take up to 24 hours, so this suits scheduled runs.
+    Only exact summary-cache hits are reused; the semantic tier is skipped.
+    """
+    repos = [r for r in repos if '/' in r.get('full_name', '')]
+    headers = {"Authorization": f"token {token}"}
+    client = _openai_client()
+    sem = asyncio.Semaphore(GITHUB_CONCURRENCY)
+
+    async with aiohttp.ClientSession(headers=headers) as session:
+        async def readme_of(r):
+            async with sem:
+                return await fetch_repo_readme(session, r, http_cache)
+
+        readmes = await asyncio.gather(*[readme_of(r) for r in repos])
+
+    # Repositories with an identical prompt share one batch request, sent
+    # under the first one's name: prompt key -> [full names]
+    summaries, pending, sharing = {}, {}, {}
+    for r, readme in zip(repos, readmes):
+        summary = local_summary(r, readme)
+        if summary is not None:
+            summaries[r['full_name']] = summary
+            continue
+        try:
+            prompt = build_prompt(r, readme)
+        except Exception as e:
+            print(f"Summary failed for {r['full_name']}: {e}", file=sys.stderr)
+            summaries[r['full_name']] = fallback_summary(r.get('description') or '', r.get('language') or '', e)
+            continue
+        if prompt is None:
+            summaries[r['full_name']] = ""
+            continue
+        key = SummaryCache.key(model, prompt)
+        cached = cache.get(key) if cache is not None else None
+        if cached is not None:
+            summaries[r['full_name']] = cached
+            continue
+        if key not in sharing:
+            pending[r['full_name']] = prompt
+        sharing.setdefault(key, []).append(r['full_name'])
+    del readmes
+
+    if pending:
+        try:
+            results = await summarize_batch(client, model, pending)
+        except Exception as e:
+            print(f"Batch summarization failed: {e}", file=sys.stderr)
+            results = {}
+        for key, names in sharing.items():
+            if names[0] not in results:
+                continue
+            if cache is not None:
+                cache.set(key, results[names[0]], model)
+            for full in names:
+                summaries[full] = results[names[0]]
+
+    for r in repos:
+        summary = summaries.get(r['full_name'])
+        if summary is None:
+            summary = fallback_summary(r.get('description') or '', r.get('language') or '',
+                                       "no result from batch")
+        yield repo_record(r, summary)
+
+
+def dump_record(record):
+    """Serialize one output record as JSON indented by two spaces."""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(record, indent=2, ensure_ascii=False)
+
+
+async def write_records(records, path):
+    """Stream records to ``path`` as a JSON array, one record at a time.
+
+    Records go to a temporary file beside ``path`` that replaces it only once
+    every record is written, so a failed run leaves the previous output intact.
+    Returns the number of records written and how many are featured.
+    """
+    count = featured = 0
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                                    prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with open(fd, 'w', encoding='utf-8') as f:
+            f.write('[')
+            async for record in records:
+                f.write(',\n' if count else '\n')
+                f.write(textwrap.indent(dump_record(record), '  '))
+                count += 1
+                featured += record['featured']
+            f.write('\n]' if count else ']')
+        # mkstemp creates the file owner-only; keep the output's usual mode
+        os.chmod(tmp_path, os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return count, featured
 
 # -------------------------------------
 # Main entry
@@ -190,6 +797,14 @@ def main():
                         help="Output JSON filename (default: portfolio_summaries.json)")
     parser.add_argument('--model', default='gpt-3.5-turbo',
                         help="OpenAI model to use (default: gpt-3.5-turbo)")
+    parser.add_argument('--cache-dir', default='.summary_cache',
+                        help="Directory for the persistent summary cache (default: .summary_cache)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Always regenerate summaries and re-download READMEs instead of reusing cached ones")
+    parser.add_argument('--semantic-cache', action='store_true',
+                        help=f"Also reuse summaries whose prompt embedding has cosine similarity >= {SEMANTIC_THRESHOLD}")
+    parser.add_argument('--batch', action='store_true',
+                        help="Summarize via the OpenAI Batch API: half the cost, but may take up to 24 hours")
     args = parser.parse_args()
 
     gh_token = os.getenv('GITHUB_TOKEN')
@@ -201,49 +816,38 @@ def main():
     # Set up OpenAI client
     openai.api_key = oa_key
 
+    if args.no_cache:
+        cache = http_cache = None
+    else:
+        cache = SummaryCache(args.cache_dir, semantic=args.semantic_cache)
+        http_cache = diskcache.Cache(os.path.join(args.cache_dir, 'http'))
+
     if args.repos:
         repo_list = [r.strip() for r in args.repos.split(',') if r.strip()]
         print(f"🔍 Fetching specific repos: {repo_list}")
-        repos_json = fetch_specific_repos(repo_list, gh_token)
+        repos_json = fetch_specific_repos(repo_list, gh_token, http_cache)
     else:
         print(f"🔍 Fetching all repos for org: {args.org_name}")
-        repos_json = fetch_repositories(args.org_name, gh_token)
+        repos_json = fetch_all_graphql(args.org_name, gh_token)
 
     if not repos_json:
         print("No repositories found or fetched.", file=sys.stderr)
         sys.exit(1)
 
-    print(f"Building portfolio summaries for {len(repos_json)} repositories…")
-    df = create_repo_dataframe(repos_json, gh_token)
-    df = add_summaries(df)
-
-    # Prepare JSON records with additional portfolio-friendly fields
-    records = []
-    for _, row in df.iterrows():
-        record = {
-            'name': row['Name'],
-            'fullName': row['FullName'],
-            'url': row['URL'],
-            'description': row['Description'],
-            'language': row['Language'],
-            'stars': row['Stars'],
-            'forks': row['Forks'],
-            'openIssues': row['OpenIssues'],
-            'topics': row['Topics'],  # Include topics in output
-            'summary': row['Summary'],
-            'featured': row['Stars'] > 5 or row['Forks'] > 2,  # Auto-mark popular repos as featured
-        }
-        records.append(record)
-    
     # Sort by stars descending for better portfolio ordering
-    records.sort(key=lambda x: x['stars'], reverse=True)
-    
-    with open(args.output_file, 'w') as f:
-        json.dump(records, f, indent=2)
+    repos_json.sort(key=lambda r: r.get('stargazers_count', 0), reverse=True)
+
+    # Load the tokenizer up front; its first use may download the encoding,
+    # which would otherwise block the event loop mid-pipeline
+    _tiktoken_encoder()
+
+    print(f"Building portfolio summaries for {len(repos_json)} repositories…")
+    pipeline = process_repos_batch if args.batch else process_repos
+    records = pipeline(repos_json, gh_token, args.model, cache, http_cache)
+    count, featured_count = asyncio.run(write_records(records, args.output_file))
 
     print(f"✅ Saved portfolio summaries to {args.output_file}")
-    print(f"📊 Generated summaries for {len(records)} repositories")
-    featured_count = sum(1 for r in records if r['featured'])
+    print(f"📊 Generated summaries for {count} repositories")
     print(f"⭐ {featured_count} repositories marked as featured")
 
 if __name__ == '__main__':